@@ -0,0 +1,138 @@
+import csv
+from functools import lru_cache
+from heapq import heappush, heappushpop
+from math import asin, cos, radians, sin, sqrt
+from typing import List, Optional
+
+AIRPORTS_PATH = "airports.csv"
+EARTH_RADIUS_KM = 6371.0
+
+
+def to_unit_vector(lat: float, lng: float) -> tuple:
+    """
+    Convert a latitude/longitude in degrees to a point on the unit sphere.
+    """
+    lat, lng = radians(lat), radians(lng)
+    return (cos(lat) * cos(lng), cos(lat) * sin(lng), sin(lat))
+
+
+def chord_to_km(chord: float) -> float:
+    """
+    Convert the straight-line distance between two points on the unit sphere
+    to the great-circle (haversine) distance in kilometers.
+    """
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, chord / 2))
+
+
+class AirportIndex:
+    """
+    KD-tree over airport locations for k-nearest-neighbour queries.
+
+    Airports are stored as 3D points on the unit sphere, where the straight-line distance
+    increases with the great-circle distance, so the tree can use plain euclidean splits
+    and the results are converted back to haversine kilometers.
+    """
+
+    def __init__(self, airports: List[dict]):
+        self.airports = airports
+        self.points = [to_unit_vector(a["latitude"], a["longitude"]) for a in airports]
+        self.root = self._build(list(range(len(airports))), 0)
+
+    def _build(self, indices: List[int], depth: int) -> Optional[tuple]:
+        if not indices:
+            return None
+        axis = depth % 3
+        indices.sort(key=lambda i: self.points[i][axis])
+        median = len(indices) // 2
+        return (
+            indices[median],
+            axis,
+            self._build(indices[:median], depth + 1),
+            self._build(indices[median + 1:], depth + 1),
+        )
+
+    def _search(self, node, target, k, international_only, country, heap):
+        if node is None:
+            return
+        index, axis, left, right = node
+        point = self.points[index]
+        airport = self.airports[index]
+        if (not international_only or airport["international"]) and (not country or airport["country"] == country):
+            distance = sqrt(sum((p - t) ** 2 for p, t in zip(point, target)))
+            # heap holds (-distance, index) so the furthest of the current k is on top
+            if len(heap) < k:
+                heappush(heap, (-distance, index))
+            elif distance < -heap[0][0]:
+                heappushpop(heap, (-distance, index))
+        diff = target[axis] - point[axis]
+        near, far = (left, right) if diff < 0 else (right, left)
+        self._search(near, target, k, international_only, country, heap)
+        if len(heap) < k or abs(diff) < -heap[0][0]:
+            self._search(far, target, k, international_only, country, heap)
+
+    def _nearest_to_point(self, target, k, international_only, country) -> List[dict]:
+        heap = []
+        self._search(self.root, target, k, international_only, country, heap)
+        return [
+            {**self.airports[index], "distance_km": round(chord_to_km(-distance), 1)}
+            for distance, index in sorted(heap, reverse=True)
+        ]
+
+    def nearest(self, lat: float, lng: float, k: int = 3, international_only: bool = True,
+                country: Optional[str] = None) -> List[dict]:
+        """
+        Return the k airports closest to the given location, nearest first.
+
+        Args:
+            lat: Latitude in degrees.
+            lng: Longitude in degrees.
+            k: Number of airports to return.
+            international_only: Only return airports with international flights.
+            country: Only return airports in this country (as named in countries.csv).
+        """
+        return self._nearest_to_point(to_unit_vector(lat, lng), k, international_only, country)
+
+    def main_airports(self, country: Optional[str], k: int = 3, international_only: bool = True) -> List[dict]:
+        """
+        Return the k main airports of a country, ranked by their priority in airports.csv.
+        There is no reference location, so distance_km is None.
+
+        Args:
+            country: The country name as in countries.csv.
+            k: Number of airports to return.
+            international_only: Only return airports with international flights.
+        """
+        airports = [
+            a for a in self.airports
+            if a["country"] == country and (not international_only or a["international"])
+        ]
+        airports.sort(key=lambda a: a["priority"])
+        return [{**a, "distance_km": None} for a in airports[:k]]
+
+
+def load_airports(path: str = AIRPORTS_PATH) -> List[dict]:
+    """
+    Load the bundled airport dataset.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        return [
+            {
+                "iata": row["iata"],
+                "name": row["name"],
+                "city": row["city"],
+                "country": row["country"],
+                "latitude": float(row["latitude"]),
+                "longitude": float(row["longitude"]),
+                "international": row["international"] == "1",
+                "priority": int(row["priority"]),
+            }
+            for row in csv.DictReader(f)
+        ]
+
+
+@lru_cache(maxsize=1)
+def get_airport_index() -> AirportIndex:
+    """
+    Return the airport index, building it on first use.
+    """
+    return AirportIndex(load_airports())
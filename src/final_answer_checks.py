@@ -111,3 +111,36 @@ def validate_travel_dates(data) -> bool:
             return False
 
     return True
+
+
+def validate_price_fields(data) -> bool:
+    """
+    Validate that every result has the prices and dates needed to re-price it later:
+    numeric resort and flight prices, and an itinerary with a schedule list.
+    """
+    def is_number(value):
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    data = json_loads(data)
+
+    for result in data.get("results", []):
+        resort = result.get("resort", {})
+        flights = result.get("flights", {})
+        itinerary = result.get("itinerary", {})
+        prices = [
+            resort.get("price_per_night"),
+            flights.get("departing_flight", {}).get("price"),
+            flights.get("returning_flight", {}).get("price"),
+            flights.get("total_flight_cost"),
+        ]
+        if not all(is_number(price) for price in prices):
+            return False
+        if not isinstance(itinerary.get("return_date"), str):
+            return False
+        schedule = itinerary.get("schedule")
+        if not isinstance(schedule, list):
+            return False
+        if not all(isinstance(day, dict) and isinstance(day.get("date"), str) for day in schedule):
+            return False
+
+    return True
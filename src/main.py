@@ -4,6 +4,7 @@ import json
 from openinference.instrumentation.smolagents import SmolagentsInstrumentor
 from os import getenv
 from phoenix.otel import register
+import sqlite3
 from smolagents import (
     CodeAgent,
     WebSearchTool,
@@ -11,9 +12,22 @@ from smolagents import (
     OpenAIServerModel,
 )
 
-from src.final_answer_checks import validate_json_schema, validate_sorted_by_cost, validate_travel_dates
+from src.final_answer_checks import (
+    validate_at_least_one_result,
+    validate_json_schema,
+    validate_price_fields,
+    validate_sorted_by_cost,
+    validate_travel_dates,
+)
 from src.json_schema import output_schema
-from src.tools import get_country_id, get_possible_date_ranges, PadiResortsSearch, KiwiFlightSearch
+from src.result_store import ResultStore, normalize_key
+from src.tools import (
+    get_country_id,
+    get_possible_date_ranges,
+    PadiResortsSearch,
+    NearestAirportsSearch,
+    KiwiFlightSearch,
+)
 from src.utils import get_user_input
 
 # Load environment variables from .env file
@@ -22,11 +36,13 @@ dotenv.load_dotenv()
 # Initialize tools and agent
 visit_website_tool = VisitWebpageTool()
 padi_resorts_tool = PadiResortsSearch()
+nearest_airports_tool = NearestAirportsSearch()
 search_flights_tool = KiwiFlightSearch()
 tools = [
     get_country_id,
     get_possible_date_ranges,
     padi_resorts_tool,
+    nearest_airports_tool,
     search_flights_tool,
     WebSearchTool(),
     VisitWebpageTool(),
@@ -58,7 +74,23 @@ agent = CodeAgent(
 )
 
 
-def run_agent(animals, location, num_divers, num_nights, month, year, departure_location):
+def run_agent(animals, location, num_divers, num_nights, month, year, departure_location, use_store=True):
+    if use_store:
+        key = normalize_key(resolve_country(location), month, year, num_nights, num_divers, departure_location,
+                            animals)
+        try:
+            store = ResultStore()
+            try:
+                cached = store.get(key)
+            finally:
+                store.close()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Could not read the result store, running the agent: {e}")
+            cached = None
+        if cached:
+            print(f"Serving cached answer for {key}")
+            return cached
+
     prompt = f"""
 You are a scuba dive trip coordinator AI.
 Your task is to help the user plan scuba diving vacations by finding the best budget-friendly options.
@@ -81,6 +113,9 @@ User preferences:
 Your goal:
 1. Find the **top 3 most budget-friendly dive resorts** that match the user's preferences.
 2. Include **round-trip flight options** from the departure location to the nearest airport.
+   Use `nearest_airports_search` once with all the resorts to find their arrival airports.
+   Don't browse for airports that have a `distance_km`. Airports with a null `distance_km` are only
+   country-level guesses, so check which airport serves those resorts with a web search.
 3. Create a **detailed itinerary** for each option, making sure to:
    - Include all travel days, including flight days.
    - Include check-in and check-out dates.
@@ -102,9 +137,43 @@ Always output **only JSON**, without any additional text.
         answer = answer[len("```json"):].strip()
     if answer.endswith("```"):
         answer = answer[:-len("```")].strip()
+
+    if use_store and is_valid_answer(answer):
+        try:
+            store = ResultStore()
+            try:
+                store.save(key, answer)
+            finally:
+                store.close()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Could not save the answer to the result store: {e}")
     return answer
 
 
+def resolve_country(location):
+    """
+    Resolve the location to a country for the result store key, falling back to the raw location
+    if the lookup fails so the cache never stops an agent run.
+    """
+    try:
+        return get_country_id(location).get("country") or location
+    except Exception as e:
+        print(f"Could not resolve the country for {location}, using it as is: {e}")
+        return location
+
+
+def is_valid_answer(answer):
+    try:
+        return (
+            validate_at_least_one_result(answer)
+            and validate_sorted_by_cost(answer)
+            and validate_travel_dates(answer)
+            and validate_price_fields(answer)
+        )
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return False
+
+
 def main():
     animals, location, num_divers, num_nights, month, year, departure_location = get_user_input()
     run_agent(animals, location, num_divers, num_nights, month, year, departure_location)
@@ -0,0 +1,242 @@
+from copy import deepcopy
+from datetime import date, datetime, timedelta
+import json
+from os import getenv
+from pathlib import Path
+import sqlite3
+from typing import List, Optional
+
+DEFAULT_STORE_PATH = "results/results.db"
+# Cached prices older than this are considered stale and will trigger a new agent run
+MAX_PRICE_AGE = timedelta(days=1)
+# Near matches may differ by at most this many nights to be re-priced from the cache
+MAX_NIGHTS_DELTA = 2
+# and by at most this many divers, as resort availability was only checked for the cached number of divers
+MAX_DIVERS_DELTA = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trip_results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    country TEXT NOT NULL,
+    month INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    nights INTEGER NOT NULL,
+    divers INTEGER NOT NULL,
+    departure_airport TEXT NOT NULL,
+    species TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    answer TEXT NOT NULL CHECK (json_valid(answer))
+);
+CREATE INDEX IF NOT EXISTS idx_trip_results_key
+    ON trip_results (country, month, year, departure_airport, species, nights, divers, created_at);
+"""
+
+
+def normalize_key(country: str, month, year, nights: int, divers: int, departure_airport: str,
+                  animals: List[str]) -> dict:
+    """
+    Normalize the user inputs into the key used to look up cached results.
+
+    Args:
+        country: The resolved country name (or the raw location if it could not be resolved).
+        month: The month name (e.g., "October") or number.
+        year: The year as an integer or string.
+        nights: The number of nights.
+        divers: The number of divers.
+        departure_airport: The departure airport IATA code.
+        animals: A list of marine animals the user wants to see.
+    """
+    if isinstance(month, str):
+        month = datetime.strptime(month.strip().title(), "%B").month
+    species = sorted({a.strip().lower() for a in animals if a.strip()})
+    return {
+        "country": " ".join(country.split()).lower(),
+        "month": int(month),
+        "year": int(year),
+        "nights": int(nights),
+        "divers": int(divers),
+        "departure_airport": departure_airport.strip().upper(),
+        "species": json.dumps(species),
+    }
+
+
+def _shift(value: str, days: int) -> str:
+    """
+    Shift an ISO date or datetime string by a number of days, keeping its format.
+    """
+    if "T" in value:
+        return (datetime.fromisoformat(value) + timedelta(days=days)).strftime("%Y-%m-%dT%H:%M")
+    return (date.fromisoformat(value) + timedelta(days=days)).isoformat()
+
+
+def _adjust_schedule(schedule: List[dict], check_in: str, check_out: str, nights_delta: int) -> List[dict]:
+    """
+    Add or remove resort days before check-out so the schedule covers the new number of nights.
+    Days up to and including check-in are always kept, and days on or after the original
+    check-out date are shifted accordingly.
+    """
+    arrival = [day for day in schedule if day["date"] <= check_in]
+    stay = [day for day in schedule if check_in < day["date"] < check_out]
+    departure = [day for day in schedule if day["date"] >= check_out]
+    if nights_delta > 0:
+        last_date = stay[-1]["date"] if stay else _shift(check_out, -1)
+        for i in range(1, nights_delta + 1):
+            stay.append({"date": _shift(last_date, i), "activities": ["Diving"]})
+    elif nights_delta < 0:
+        stay = stay[:max(0, len(stay) + nights_delta)]
+    for day in departure:
+        day["date"] = _shift(day["date"], nights_delta)
+    adjusted = arrival + stay + departure
+    for i, day in enumerate(adjusted, start=1):
+        day["day"] = i
+    return adjusted
+
+
+def reprice_package(package: dict, cached_nights: int, cached_divers: int, nights: int, divers: int) -> dict:
+    """
+    Re-price a cached package for a different number of nights and divers.
+
+    Resort and flight prices are scaled per diver, the resort cost per night, and the
+    check-out, return flight and itinerary dates are moved by the difference in nights.
+    The return flight is not searched again, so the package is marked as an estimate.
+    Raises ValueError if the new check-out date falls outside the check-in month.
+
+    Args:
+        package: A single entry from the "results" list of a cached answer.
+        cached_nights: The number of nights the package was priced for.
+        cached_divers: The number of divers the package was priced for.
+        nights: The requested number of nights.
+        divers: The requested number of divers.
+    """
+    package = deepcopy(package)
+    diver_ratio = divers / cached_divers
+    nights_delta = nights - cached_nights
+
+    resort = package["resort"]
+    resort["price_per_night"] = round(resort["price_per_night"] * diver_ratio, 2)
+    resort["total_resort_cost"] = round(resort["price_per_night"] * nights, 2)
+    original_check_out = resort["check_out"]
+    resort["check_out"] = _shift(original_check_out, nights_delta)
+    check_in_date = date.fromisoformat(resort["check_in"])
+    check_out_date = date.fromisoformat(resort["check_out"])
+    if (check_out_date.year, check_out_date.month) != (check_in_date.year, check_in_date.month):
+        raise ValueError(
+            f"Check-out {resort['check_out']} is outside the month of check-in {resort['check_in']}"
+        )
+
+    flights = package["flights"]
+    for flight in (flights["departing_flight"], flights["returning_flight"]):
+        flight["price"] = round(flight["price"] * diver_ratio, 2)
+    returning_flight = flights["returning_flight"]
+    returning_flight["departure_datetime"] = _shift(returning_flight["departure_datetime"], nights_delta)
+    returning_flight["arrival_datetime"] = _shift(returning_flight["arrival_datetime"], nights_delta)
+    flights["total_flight_cost"] = round(flights["total_flight_cost"] * diver_ratio, 2)
+
+    itinerary = package["itinerary"]
+    itinerary["return_date"] = _shift(itinerary["return_date"], nights_delta)
+    itinerary["schedule"] = _adjust_schedule(
+        itinerary["schedule"], resort["check_in"], original_check_out, nights_delta
+    )
+
+    package["total_package_cost"] = round(resort["total_resort_cost"] + flights["total_flight_cost"], 2)
+    package["estimate"] = True
+    return package
+
+
+class ResultStore:
+    """
+    SQLite backed store of validated agent answers, keyed by the normalized user inputs.
+
+    Exact matches are served as-is, near matches (same trip with a few divers or nights more
+    or less) are re-priced from the cached resort and flight prices.
+    Entries older than max_age are ignored so prices get refreshed by a new agent run.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_age: timedelta = MAX_PRICE_AGE):
+        self.path = Path(path or getenv("RESULT_STORE_PATH", DEFAULT_STORE_PATH))
+        self.max_age = max_age
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def save(self, key: dict, answer: str, created_at: Optional[datetime] = None):
+        """
+        Persist a validated answer for the given key.
+
+        Args:
+            key: The key returned by normalize_key.
+            answer: The agent answer as a JSON string.
+            created_at: When the prices were fetched, defaults to now.
+        """
+        created_at = created_at or datetime.now()
+        with self.connection:
+            self.connection.execute(
+                """
+                INSERT INTO trip_results
+                    (country, month, year, nights, divers, departure_airport, species, created_at, answer)
+                VALUES
+                    (:country, :month, :year, :nights, :divers, :departure_airport, :species, :created_at, json(:answer))
+                """,  # noqa: E501
+                {**key, "created_at": created_at.isoformat(), "answer": answer},
+            )
+
+    def _fresh_candidates(self, key: dict, now: datetime) -> List[sqlite3.Row]:
+        return self.connection.execute(
+            """
+            SELECT nights, divers, created_at, answer FROM trip_results
+            WHERE country = :country AND month = :month AND year = :year
+                AND departure_airport = :departure_airport AND species = :species
+                AND nights BETWEEN :nights - :max_nights_delta AND :nights + :max_nights_delta
+                AND divers BETWEEN :divers - :max_divers_delta AND :divers + :max_divers_delta
+                AND created_at >= :oldest
+            ORDER BY abs(nights - :nights), abs(divers - :divers), created_at DESC
+            """,
+            {
+                **key,
+                "max_nights_delta": MAX_NIGHTS_DELTA,
+                "max_divers_delta": MAX_DIVERS_DELTA,
+                "oldest": (now - self.max_age).isoformat(),
+            },
+        ).fetchall()
+
+    def get_exact(self, key: dict, now: Optional[datetime] = None) -> Optional[str]:
+        """
+        Return the most recent fresh answer stored for exactly this key, or None.
+        """
+        for row in self._fresh_candidates(key, now or datetime.now()):
+            if row["nights"] == key["nights"] and row["divers"] == key["divers"]:
+                return row["answer"]
+        return None
+
+    def get_near(self, key: dict, now: Optional[datetime] = None) -> Optional[str]:
+        """
+        Re-price the closest fresh answer for the same trip with a different number of
+        nights or divers. Packages that cannot be re-priced (missing prices, or a check-out
+        outside the month) are dropped. Returns the re-priced answer as a JSON string, or None.
+        """
+        for row in self._fresh_candidates(key, now or datetime.now()):
+            cached = json.loads(row["answer"])
+            results = []
+            for package in cached.get("results", []):
+                try:
+                    results.append(
+                        reprice_package(package, row["nights"], row["divers"], key["nights"], key["divers"])
+                    )
+                except (KeyError, TypeError, ValueError, AttributeError):
+                    continue
+            if not results:
+                # Nothing in this answer could be re-priced, try the next candidate
+                continue
+            results.sort(key=lambda package: package["total_package_cost"])
+            return json.dumps({"results": results}, indent=4)
+        return None
+
+    def get(self, key: dict, now: Optional[datetime] = None) -> Optional[str]:
+        """
+        Return a cached answer for the key, preferring exact matches over re-priced near matches.
+        """
+        return self.get_exact(key, now) or self.get_near(key, now)
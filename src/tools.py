@@ -6,6 +6,7 @@ from pandas import read_csv
 import requests
 from smolagents import Tool, tool
 
+from src.airports import get_airport_index
 from src.utils import get_slug
 
 
@@ -85,6 +86,26 @@ def get_possible_date_ranges(year: int, month_name: str, nights: int) -> list[di
     return possible_ranges
 
 
+def _get_coordinates(resort: dict) -> tuple:
+    """
+    Return the (latitude, longitude) of a resort, or (None, None) if it has no usable coordinates.
+
+    The PADI field names are not documented, so both top-level latitude/longitude (or lat/lng)
+    and a nested location/coordinates/gps object are accepted.
+    """
+    candidates = [resort] + [resort.get(key) for key in ("location", "coordinates", "gps")]
+    for candidate in candidates:
+        if not isinstance(candidate, dict):
+            continue
+        lat = candidate.get("latitude", candidate.get("lat"))
+        lng = candidate.get("longitude", candidate.get("lng", candidate.get("lon")))
+        try:
+            return float(lat), float(lng)
+        except (TypeError, ValueError):
+            continue
+    return None, None
+
+
 class PadiResortsSearch(Tool):
     name = "padi_resorts_search"
     description = """Search available dive resorts in a given country from PADI Travel.
@@ -111,6 +132,7 @@ class PadiResortsSearch(Tool):
         if "results" in json_data:
             results = json_data["results"]
             for result in results:
+                latitude, longitude = _get_coordinates(result)
                 trimmed_result = {
                     "title": result.get("title"),
                     "diveCenterTitle": result.get("diveCenterTitle"),
@@ -119,11 +141,59 @@ class PadiResortsSearch(Tool):
                     "priceSum": result.get("priceSum"),
                     "url": result.get("url"),
                     "numberOfDives": result.get("numberOfDives"),
+                    "latitude": latitude,
+                    "longitude": longitude,
                 }
                 trimmed_data.append(trimmed_result)
         return trimmed_data
 
 
+class NearestAirportsSearch(Tool):
+    name = "nearest_airports_search"
+    description = """Find the nearest airports for a list of dive resorts from an offline dataset.
+    Pass the resorts returned by padi_resorts_search in a single call, no web browsing is needed.
+    Input: resorts (array of objects with title, countryTitle and optionally latitude/longitude), k (int)
+    Returns, for each resort, its title and the k nearest airports in the resort's country
+    (iata, name, city, country, international, distance_km), nearest first. Regional gateways with
+    international false need a connecting flight, so the nearest international airport is always included.
+    Resorts without coordinates get the main airports of their country with distance_km null: these are
+    country-level guesses, not the airports nearest the resort.
+    Use the iata code as arr_airport for kiwi_flight_search.
+    """
+    inputs = {
+        "resorts": {"type": "array", "description": "Resorts as returned by padi_resorts_search"},
+        "k": {"type": "integer", "description": "Number of airports to return per resort", "nullable": True},
+    }
+    output_type = "array"
+
+    def forward(self, resorts, k=3):
+        k = k or 3
+        index = get_airport_index()
+        results = []
+        for resort in resorts:
+            lat, lng = _get_coordinates(resort)
+            country = resort.get("countryTitle")
+            if lat is not None:
+                # Stay in the resort's country so a closer airport across a border is not picked
+                airports = (index.nearest(lat, lng, k=k, international_only=False, country=country)
+                            or index.nearest(lat, lng, k=k, international_only=False))
+                if not any(airport["international"] for airport in airports):
+                    airports += (index.nearest(lat, lng, k=1, country=country)
+                                 or index.nearest(lat, lng, k=1))
+            else:
+                # Without coordinates, fall back to the main airports of the resort's country
+                airports = (index.main_airports(country, k=k)
+                            or index.main_airports(country, k=k, international_only=False))
+            results.append({
+                "title": resort.get("title"),
+                "airports": [
+                    {key: airport[key] for key in ("iata", "name", "city", "country", "international", "distance_km")}
+                    for airport in airports
+                ],
+            })
+        return results
+
+
 class KiwiFlightSearch(Tool):
     name = "kiwi_flight_search"
     description = """Search available flights on Kiwi.com.
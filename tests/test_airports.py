@@ -0,0 +1,45 @@
+from math import asin, cos, radians, sin, sqrt
+import random
+
+from src.airports import get_airport_index
+
+
+def test_nearest_airports_to_resort():
+    # Mamanuca islands, Fiji
+    airports = get_airport_index().nearest(-17.77, 177.1, k=2)
+    assert [a["iata"] for a in airports] == ["NAN", "SUV"]
+    assert airports[0]["distance_km"] < airports[1]["distance_km"]
+
+
+def test_international_only():
+    # Townsville, whose airport is not international, so Cairns (about 280 km away) is returned
+    airports = get_airport_index().nearest(-19.26, 146.8, k=1)
+    assert airports[0]["iata"] == "CNS"
+    airports = get_airport_index().nearest(-19.26, 146.8, k=1, international_only=False)
+    assert airports[0]["iata"] == "TSV"
+
+
+def test_main_airports():
+    index = get_airport_index()
+    assert [a["iata"] for a in index.main_airports("Indonesia", k=2)] == ["DPS", "CGK"]
+    assert [a["iata"] for a in index.main_airports("Maldives", k=3)] == ["MLE", "GAN"]
+    assert all(a["distance_km"] is None for a in index.main_airports("Mexico"))
+    assert index.main_airports(None) == []
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(radians, (lat1, lng1, lat2, lng2))
+    h = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lng2 - lng1) / 2) ** 2
+    return 2 * 6371.0 * asin(sqrt(h))
+
+
+def test_nearest_matches_brute_force():
+    index = get_airport_index()
+    rng = random.Random(0)
+    for _ in range(3000):
+        lat, lng = rng.uniform(-90, 90), rng.uniform(-180, 180)
+        expected = sorted(index.airports, key=lambda a: haversine_km(lat, lng, a["latitude"], a["longitude"]))[:5]
+        airports = index.nearest(lat, lng, k=5, international_only=False)
+        assert [a["iata"] for a in airports] == [a["iata"] for a in expected]
+        for airport, match in zip(airports, expected):
+            assert abs(airport["distance_km"] - haversine_km(lat, lng, match["latitude"], match["longitude"])) < 0.1
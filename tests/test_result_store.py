@@ -0,0 +1,146 @@
+from datetime import datetime, timedelta
+import json
+
+import pytest
+
+from src.final_answer_checks import validate_price_fields, validate_sorted_by_cost, validate_travel_dates
+from src.result_store import ResultStore, normalize_key
+
+
+answer = {
+    "results": [
+        {
+            "resort": {
+                "name": "Matamanoa Island",
+                "location": "Fiji",
+                "check_in": "2026-10-26",
+                "check_out": "2026-10-28",
+                "price_per_night": 200.00,
+                "total_resort_cost": 400.00,
+                "amenities": ["Pool"],
+                "dive_highlights": ["Sharks"],
+                "url": "https://travel.padi.com/dive-resort/fiji/matamanoa-island/"
+            },
+            "flights": {
+                "departing_flight": {
+                    "departure_datetime": "2026-10-24T22:30",
+                    "arrival_datetime": "2026-10-26T05:30",
+                    "airline": "Fiji Airways",
+                    "price": 500.00,
+                    "layovers": [],
+                    "flight_time": "10h 0m"
+                },
+                "returning_flight": {
+                    "departure_datetime": "2026-10-28T21:00",
+                    "arrival_datetime": "2026-10-28T11:00",
+                    "airline": "Fiji Airways",
+                    "price": 500.00,
+                    "layovers": [],
+                    "flight_time": "10h 0m"
+                },
+                "total_flight_cost": 1000.00
+            },
+            "itinerary": {
+                "departure_date": "2026-10-24",
+                "return_date": "2026-10-28",
+                "schedule": [
+                    {"day": 1, "date": "2026-10-24", "activities": ["Depart LAX"]},
+                    {"day": 2, "date": "2026-10-26", "activities": ["Check in"]},
+                    {"day": 3, "date": "2026-10-27", "activities": ["Shark dive"]},
+                    {"day": 4, "date": "2026-10-28", "activities": ["Check out", "Depart NAN"]}
+                ]
+            },
+            "total_package_cost": 1400.00,
+            "currency": "USD"
+        }
+    ]
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(tmp_path / "results.db")
+    yield store
+    store.close()
+
+
+def make_key(nights=2, divers=2):
+    return normalize_key("Fiji", "October", 2026, nights, divers, "lax", ["Sharks"])
+
+
+def test_normalize_key():
+    assert make_key() == normalize_key(" fiji ", 10, "2026", 2, 2, "LAX", ["sharks", ""])
+
+
+def test_exact_match(store):
+    store.save(make_key(), json.dumps(answer))
+    assert json.loads(store.get(make_key())) == answer
+
+
+def test_near_match_is_repriced(store):
+    store.save(make_key(), json.dumps(answer))
+    cached = store.get(make_key(nights=3, divers=4))
+    package = json.loads(cached)["results"][0]
+
+    assert package["resort"]["check_out"] == "2026-10-29"
+    assert package["resort"]["total_resort_cost"] == 1200.00
+    assert package["flights"]["total_flight_cost"] == 2000.00
+    assert package["total_package_cost"] == 3200.00
+    assert package["estimate"]
+    assert [day["day"] for day in package["itinerary"]["schedule"]] == [1, 2, 3, 4, 5]
+    assert validate_sorted_by_cost(cached)
+    assert validate_travel_dates(cached)
+
+
+def test_stale_and_distant_entries_are_ignored(store):
+    store.save(make_key(), json.dumps(answer), created_at=datetime.now() - timedelta(days=2))
+    assert store.get(make_key()) is None
+
+    store.save(make_key(), json.dumps(answer))
+    assert store.get(make_key(nights=10)) is None
+    assert store.get(make_key(divers=40)) is None
+
+
+def test_malformed_answers_are_not_cached_or_repriced(store):
+    malformed = json.loads(json.dumps(answer))
+    malformed["results"][0]["resort"]["price_per_night"] = "$200"
+    del malformed["results"][0]["itinerary"]
+    assert not validate_price_fields(json.dumps(malformed))
+    assert validate_price_fields(json.dumps(answer))
+
+    store.save(make_key(), json.dumps(malformed))
+    assert store.get(make_key(divers=3)) is None
+
+    store.save(make_key(), json.dumps(answer))
+    assert json.loads(store.get(make_key(divers=3)))["results"][0]["total_package_cost"] == 2100.00
+
+
+def test_near_match_leaving_the_month_is_rejected(store):
+    late = json.loads(json.dumps(answer))
+    late["results"][0]["resort"]["check_in"] = "2026-10-29"
+    late["results"][0]["resort"]["check_out"] = "2026-10-31"
+    store.save(make_key(), json.dumps(late))
+    assert store.get(make_key(nights=4)) is None
+
+
+def test_shorter_stay_keeps_travel_and_check_in_days(store):
+    longer = json.loads(json.dumps(answer))
+    longer["results"][0]["resort"]["check_out"] = "2026-10-29"
+    longer["results"][0]["resort"]["total_resort_cost"] = 600.00
+    longer["results"][0]["flights"]["returning_flight"]["departure_datetime"] = "2026-10-29T21:00"
+    longer["results"][0]["flights"]["returning_flight"]["arrival_datetime"] = "2026-10-29T11:00"
+    longer["results"][0]["itinerary"]["return_date"] = "2026-10-29"
+    longer["results"][0]["itinerary"]["schedule"] = [
+        {"day": 1, "date": "2026-10-24", "activities": ["Depart LAX"]},
+        {"day": 2, "date": "2026-10-25", "activities": ["Cross the date line"]},
+        {"day": 3, "date": "2026-10-26", "activities": ["Check in"]},
+        {"day": 4, "date": "2026-10-28", "activities": ["Manta dive"]},
+        {"day": 5, "date": "2026-10-29", "activities": ["Check out", "Depart NAN"]},
+    ]
+    store.save(make_key(nights=3), json.dumps(longer))
+    package = json.loads(store.get(make_key(nights=1)))["results"][0]
+
+    schedule = package["itinerary"]["schedule"]
+    assert [day["date"] for day in schedule] == ["2026-10-24", "2026-10-25", "2026-10-26", "2026-10-27"]
+    assert schedule[2]["activities"] == ["Check in"]
+    assert package["resort"]["check_out"] == "2026-10-27"
@@ -83,7 +83,7 @@ def test_case(request):
 
 
 def test_run_agent(test_case):
-    result = run_agent(**test_case["inputs"])
+    result = run_agent(**test_case["inputs"], use_store=False)
     test_name = test_case["name"].replace(" ", "_")
     # using Path, create results directory if it doesn't exist
     results_path = Path("results")
@@ -0,0 +1,59 @@
+from src.tools import NearestAirportsSearch, _get_coordinates
+
+
+def test_get_coordinates():
+    assert _get_coordinates({"latitude": -17.77, "longitude": 177.1}) == (-17.77, 177.1)
+    assert _get_coordinates({"location": {"lat": "-8.5", "lng": "115.3"}}) == (-8.5, 115.3)
+    assert _get_coordinates({"latitude": None, "longitude": None}) == (None, None)
+    assert _get_coordinates({"latitude": "", "longitude": ""}) == (None, None)
+
+
+def test_nearest_airports_search_mixed_resorts():
+    resorts = [
+        {"title": "Matamanoa Island", "countryTitle": "Fiji", "latitude": -17.77, "longitude": 177.1},
+        {"title": "Bali Resort", "countryTitle": "Indonesia", "latitude": None, "longitude": None},
+        {"title": "Statia Resort", "countryTitle": "Sint Eustatius"},
+        {"title": "Unknown", "countryTitle": None},
+        {"title": "Nowhere", "countryTitle": "Atlantis"},
+    ]
+    results = NearestAirportsSearch().forward(resorts, k=2)
+
+    assert [r["title"] for r in results] == [r["title"] for r in resorts]
+    fiji, bali, statia, unknown, nowhere = results
+    assert [a["iata"] for a in fiji["airports"]] == ["NAN", "SUV"]
+    assert all(a["distance_km"] > 0 for a in fiji["airports"])
+    assert set(fiji["airports"][0]) == {"iata", "name", "city", "country", "international", "distance_km"}
+    assert [a["iata"] for a in bali["airports"]] == ["DPS", "CGK"]
+    assert all(a["distance_km"] is None for a in bali["airports"])
+    # Sint Eustatius has no international airport, so the domestic one is returned
+    assert [a["iata"] for a in statia["airports"]] == ["EUX"]
+    assert unknown["airports"] == []
+    assert nowhere["airports"] == []
+
+
+def test_nearest_airports_search_default_k():
+    resorts = [{"title": "Matamanoa Island", "countryTitle": "Fiji", "latitude": -17.77, "longitude": 177.1}]
+    assert len(NearestAirportsSearch().forward(resorts, k=None)[0]["airports"]) == 3
+
+
+def test_nearest_airports_search_regional_gateways_and_borders():
+    resorts = [
+        {"title": "Wakatobi", "countryTitle": "Indonesia", "latitude": -5.5, "longitude": 123.8},
+        {"title": "Raja Ampat", "countryTitle": "Indonesia", "latitude": -0.5, "longitude": 130.6},
+        {"title": "Coron", "countryTitle": "Philippines", "latitude": 12.0, "longitude": 120.2},
+        {"title": "Eilat", "countryTitle": "Israel", "latitude": 29.5, "longitude": 34.92},
+        {"title": "Nowhere", "countryTitle": "Atlantis", "latitude": 12.15, "longitude": -68.28},
+    ]
+    wakatobi, raja_ampat, coron, eilat, nowhere = NearestAirportsSearch().forward(resorts, k=3)
+
+    # Regional gateways come first, and every airport stays in the resort's country
+    assert wakatobi["airports"][0]["iata"] == "WNI"
+    assert all(a["country"] == "Indonesia" for a in wakatobi["airports"])
+    assert raja_ampat["airports"][0]["iata"] == "SOQ"
+    assert coron["airports"][0]["iata"] == "USU"
+    # Only regional gateways are within k, so the nearest international airport is added
+    assert [a["iata"] for a in coron["airports"]] == ["USU", "ENI", "MPH", "KLO"]
+    assert coron["airports"][-1]["international"]
+    assert eilat["airports"][0]["iata"] == "ETM"
+    # Unknown countries fall back to the unfiltered search
+    assert nowhere["airports"][0]["iata"] == "BON"